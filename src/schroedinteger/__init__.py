@@ -14,7 +14,7 @@
 # END HEADER
 
 import random
-from functools import wraps
+from functools import partial, wraps
 import operator
 
 
@@ -42,7 +42,115 @@ class Observable(object):
         return len(self.choices) == 1
 
 
-def resolve_observation(observables, function):
+class ResolutionBudget(object):
+    def __init__(self, max_evaluations=10 ** 4, on_exceeded=None):
+        if type(max_evaluations) != int:
+            raise TypeError(
+                "max_evaluations must be a vanilla integer but got %r of "
+                "type %s" % (max_evaluations, type(max_evaluations).__name__)
+            )
+        # Fewer than this and splitting into chunks might not make progress.
+        if max_evaluations < 4:
+            raise ValueError(
+                "max_evaluations must be at least 4 but got %r" % (
+                    max_evaluations,))
+        self.max_evaluations = max_evaluations
+        self.on_exceeded = on_exceeded
+
+    def __repr__(self):
+        return "ResolutionBudget(max_evaluations=%r, on_exceeded=%r)" % (
+            self.max_evaluations, self.on_exceeded)
+
+
+resolution_budget = ResolutionBudget()
+
+
+def chunked(choices, n_chunks):
+    size = -(-len(choices) // n_chunks)
+    return [choices[i:i + size] for i in range(0, len(choices), size)]
+
+
+def narrow_pair(x, y, xs, ys, resolution):
+    # Every combination of the narrowed choices must be in resolution.
+    resolution = sorted(set(resolution))
+    a, b = random.choice(resolution)
+    resolution = set(resolution)
+    x.choices = [
+        u for u in xs if (u, b) in resolution
+    ]
+    assert a in x.choices
+    y.choices = [
+        v for v in ys if all(
+            (u, v) in resolution for u in x.choices
+        )
+    ]
+    x.change_counter += 1
+    y.change_counter += 1
+    assert b in y.choices
+
+
+def resolve_budgeted_pair(observables, function, x, y, budget):
+    assignment = {}
+    for o in observables:
+        assignment[o] = o.choices[0]
+
+    limit = budget.max_evaluations
+    xs = x.choices
+    ys = y.choices
+    answer = None
+    witness = None
+    while len(xs) * len(ys) > limit:
+        # Split into as few chunks as will make a chunk pair fit in the
+        # budget, so as to keep as much indeterminacy as we can afford to
+        # check, but never evaluate more than the budget's worth of
+        # representatives in one round.
+        n_pairs = min(limit, -(-len(xs) * len(ys) // limit))
+        n_x = round((n_pairs * len(xs) / len(ys)) ** 0.5)
+        n_x = min(len(xs), n_pairs, max(1, n_x))
+        n_y = min(len(ys), max(1, n_pairs // n_x))
+        n_x = min(len(xs), max(1, n_pairs // n_y))
+        assert n_x * n_y >= 2
+        x_chunks = chunked(xs, n_x)
+        y_chunks = chunked(ys, n_y)
+        x_reps = [random.choice(c) for c in x_chunks]
+        y_reps = [random.choice(c) for c in y_chunks]
+        if witness is not None:
+            # Keep the pair that established the answer as a representative
+            # so that some chunk is always known to produce it.
+            for reps, chunks, w in (
+                (x_reps, x_chunks, witness[0]), (y_reps, y_chunks, witness[1])
+            ):
+                for i, c in enumerate(chunks):
+                    if c[0] <= w <= c[-1]:
+                        reps[i] = w
+        results = {}
+        for i, u in enumerate(x_reps):
+            for j, v in enumerate(y_reps):
+                assignment[x] = u
+                assignment[y] = v
+                results.setdefault(function(assignment), []).append((i, j))
+        if answer is None:
+            answer = random.choice(sorted(results))
+        i, j = random.choice(results[answer])
+        xs = x_chunks[i]
+        ys = y_chunks[j]
+        witness = (x_reps[i], y_reps[j])
+
+    resolution = []
+    for u in xs:
+        for v in ys:
+            assignment[x] = u
+            assignment[y] = v
+            if function(assignment) == answer:
+                resolution.append((u, v))
+    assert resolution
+    narrow_pair(x, y, xs, ys, resolution)
+    return answer
+
+
+def resolve_observation(observables, function, budget=None):
+    if budget is None:
+        budget = resolution_budget
     observables = set(observables)
     if not observables:
         return function({})
@@ -84,6 +192,12 @@ def resolve_observation(observables, function):
     if len(indeterminate) == 2:
         x, y = indeterminate
 
+        required = len(x.choices) * len(y.choices)
+        if required > budget.max_evaluations:
+            if budget.on_exceeded is not None:
+                budget.on_exceeded(observables, required)
+            return resolve_budgeted_pair(observables, function, x, y, budget)
+
         assignment = {}
         for o in observables:
             assignment[o] = o.choices[0]
@@ -100,20 +214,7 @@ def resolve_observation(observables, function):
             return results[0][0]
         else:
             answer, resolution = random.choice(results)
-            resolution = sorted(set(resolution))
-            a, b = random.choice(resolution)
-            x.choices = [
-                u for u in x.choices if (u, b) in resolution
-            ]
-            assert a in x.choices
-            y.choices = [
-                v for v in y.choices if all(
-                    (u, v) in resolution for u in x.choices
-                )
-            ]
-            x.change_counter += 1
-            y.change_counter += 1
-            assert b in y.choices
+            narrow_pair(x, y, x.choices, y.choices, resolution)
             return answer
 
     # We don't want to deal with too much indeterminacy so we resolve a
@@ -125,7 +226,7 @@ def resolve_observation(observables, function):
 
     assert len([o for o in observables if not o.is_determined]) <= 2
     # We're now down to two so can try again.
-    return resolve_observation(observables, function)
+    return resolve_observation(observables, function, budget)
 
 
 def cache_answer(fn):
@@ -445,3 +546,156 @@ schroedinteger.__neg__ = compute_unary(operator.neg)
 schroedinteger.__pos__ = compute_unary(operator.pos)
 schroedinteger.__abs__ = compute_unary(abs)
 schroedinteger.__invert__ = compute_unary(operator.invert)
+
+
+def observe(function, *values):
+    # Unlike combining comparisons with and/or, this narrows all the values
+    # together in a single observation.
+    observables = set()
+    for v in values:
+        if isinstance(v, schroedinteger):
+            observables |= v.observables
+
+    def observe_value(resolution):
+        return function(*[
+            v.observe_value(resolution) if isinstance(v, schroedinteger)
+            else v
+            for v in values
+        ])
+    return resolve_observation(observables, observe_value)
+
+
+def independent_groups(values):
+    # Groups of indices into values, together with their indeterminate
+    # observables, such that no two groups share one.
+    groups = {}
+    owner = {}
+    for i, v in enumerate(values):
+        indices = [i]
+        observables = set()
+        if isinstance(v, schroedinteger):
+            observables = {o for o in v.observables if not o.is_determined}
+        for key in {owner[o] for o in observables if o in owner}:
+            other_indices, other_observables = groups.pop(key)
+            indices.extend(other_indices)
+            observables |= other_observables
+        for o in observables:
+            owner[o] = i
+        groups[i] = (sorted(indices), observables)
+    return sorted(groups.values(), key=lambda g: g[0][0])
+
+
+def possible_outcomes(values, observables, function):
+    # Maps each possible value of function(*values) to a callable that narrows
+    # observables so as to force it, without narrowing anything yet. Returns
+    # None when that would be too much work to work out exhaustively.
+    indeterminate = sorted(observables, key=lambda o: o.choices)
+    if len(indeterminate) > 2:
+        return None
+    if len(indeterminate) == 2:
+        x, y = indeterminate
+        if len(x.choices) * len(y.choices) > (
+            resolution_budget.max_evaluations
+        ):
+            return None
+
+    assignment = {}
+    for v in values:
+        if isinstance(v, schroedinteger):
+            for o in v.observables:
+                assignment[o] = o.choices[0]
+
+    def evaluate():
+        return function(*[
+            v.observe_value(assignment) if isinstance(v, schroedinteger)
+            else v
+            for v in values
+        ])
+
+    if not indeterminate:
+        return {evaluate(): lambda: None}
+
+    results = {}
+    if len(indeterminate) == 1:
+        decider, = indeterminate
+        for u in decider.choices:
+            assignment[decider] = u
+            results.setdefault(evaluate(), []).append(u)
+        if len(results) == 1:
+            return {answer: lambda: None for answer in results}
+        return {
+            answer: partial(narrow_choices, decider, choices)
+            for answer, choices in results.items()
+        }
+
+    for u in x.choices:
+        for v in y.choices:
+            assignment[x] = u
+            assignment[y] = v
+            results.setdefault(evaluate(), []).append((u, v))
+    if len(results) == 1:
+        return {answer: lambda: None for answer in results}
+    return {
+        answer: partial(narrow_pair, x, y, x.choices, y.choices, resolution)
+        for answer, resolution in results.items()
+    }
+
+
+def narrow_choices(observable, choices):
+    if len(choices) < len(observable.choices):
+        observable.choices = list(choices)
+        observable.change_counter += 1
+
+
+def observe_predicates(values, predicate=bool):
+    # Values that don't share observables are observed separately, so each
+    # is only narrowed as far as its own answer requires.
+    values = list(values)
+    answers = [None] * len(values)
+    for indices, _ in independent_groups(values):
+        group_answers = observe(
+            lambda *vs: tuple(bool(predicate(v)) for v in vs),
+            *[values[i] for i in indices])
+        for i, answer in zip(indices, group_answers):
+            answers[i] = answer
+    return tuple(answers)
+
+
+def all_(values, predicate=bool):
+    values = list(values)
+
+    def check(*vs):
+        return all(predicate(v) for v in vs)
+
+    outcomes = []
+    large = []
+    for indices, observables in independent_groups(values):
+        group = [values[i] for i in indices]
+        group_outcomes = possible_outcomes(group, observables, check)
+        if group_outcomes is None:
+            large.extend(group)
+        else:
+            outcomes.append(group_outcomes)
+
+    # Pick the answer before narrowing anything, and then narrow only what
+    # that answer needs: Every group for True, a single group for False.
+    falsifiable = [o for o in outcomes if False in o]
+    possible = []
+    if all(True in o for o in outcomes):
+        possible.append(True)
+    if falsifiable:
+        possible.append(False)
+    if not random.choice(possible):
+        random.choice(falsifiable)[False]()
+        return False
+    # Groups too big to enumerate can only be observed, and that has to be
+    # done all at once so as not to narrow one and then fail on another.
+    if large and not observe(check, *large):
+        return False
+    for o in outcomes:
+        o[True]()
+    return True
+
+
+def any_(values, predicate=bool):
+    return not all_(values, lambda v: not predicate(v))
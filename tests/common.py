@@ -8,3 +8,8 @@ schroedintegers = st.builds(
 )
 
 mixed_integers = schroedintegers | st.integers()
+
+
+def only_observable(x):
+    o, = x.observables
+    return o
@@ -0,0 +1,110 @@
+from hypothesis import strategies as st
+from hypothesis import given, settings
+import schroedinteger as sch
+from schroedinteger import schroedinteger, ResolutionBudget
+import pytest
+import operator
+import math
+
+from tests.common import only_observable
+
+
+def test_budget_must_allow_progress():
+    with pytest.raises(ValueError):
+        ResolutionBudget(max_evaluations=3)
+
+
+def test_budget_must_be_an_integer():
+    with pytest.raises(TypeError):
+        ResolutionBudget(max_evaluations=1e4)
+
+
+@pytest.mark.parametrize('op', [operator.lt, operator.eq, operator.ne])
+@settings(max_examples=20)
+@given(st.random_module())
+def test_wide_observation_is_consistent(op, rnd):
+    x = schroedinteger(range(300))
+    y = schroedinteger(range(300))
+    assert 300 ** 2 > sch.resolution_budget.max_evaluations
+    answer = op(x, y)
+    for u in only_observable(x).choices:
+        for v in only_observable(y).choices:
+            assert op(u, v) == answer
+    assert op(int(x), int(y)) == answer
+
+
+@given(st.random_module())
+def test_budget_overrun_calls_hook(rnd):
+    calls = []
+    budget = ResolutionBudget(
+        max_evaluations=100,
+        on_exceeded=lambda observables, required: calls.append(required))
+    x = sch.Observable(range(20))
+    y = sch.Observable(range(30))
+    sch.resolve_observation(
+        [x, y], lambda assignment: assignment[x] < assignment[y], budget)
+    assert calls == [600]
+
+
+@given(st.random_module())
+def test_within_budget_does_not_call_hook(rnd):
+    calls = []
+    budget = ResolutionBudget(
+        max_evaluations=100,
+        on_exceeded=lambda observables, required: calls.append(required))
+    x = sch.Observable(range(10))
+    y = sch.Observable(range(10))
+    sch.resolve_observation(
+        [x, y], lambda assignment: assignment[x] < assignment[y], budget)
+    assert calls == []
+
+
+@given(
+    st.lists(st.integers(), min_size=1), st.lists(st.integers(), min_size=1),
+    st.random_module())
+def test_small_budget_agrees_with_eventual_answer(xs, ys, rnd):
+    budget = ResolutionBudget(max_evaluations=4)
+    x = sch.Observable(xs)
+    y = sch.Observable(ys)
+    answer = sch.resolve_observation(
+        [x, y], lambda assignment: assignment[x] <= assignment[y], budget)
+    for u in x.choices:
+        for v in y.choices:
+            assert (u <= v) == answer
+
+
+@given(
+    st.integers(4, 100), st.integers(2, 2000), st.integers(2, 2000),
+    st.random_module())
+def test_budgeted_resolution_does_bounded_work(limit, n, m, rnd):
+    budget = ResolutionBudget(max_evaluations=limit)
+    x = sch.Observable(range(n))
+    y = sch.Observable(range(m))
+    calls = []
+
+    def function(assignment):
+        calls.append(assignment)
+        return (assignment[x] * 7 + assignment[y] * 3) % 5
+
+    answer = sch.resolve_observation([x, y], function, budget)
+    size = n * m
+    if size <= limit:
+        assert len(calls) == size
+    else:
+        assert len(calls) <= limit * (1 + math.log(size) / math.log(limit))
+    for u in x.choices:
+        for v in y.choices:
+            assert (u * 7 + v * 3) % 5 == answer
+
+
+@settings(max_examples=20)
+@given(st.random_module())
+def test_just_over_budget_keeps_indeterminacy(rnd):
+    x = schroedinteger(range(150))
+    y = schroedinteger(range(150))
+    assert 150 ** 2 > sch.resolution_budget.max_evaluations
+    x < y
+    # This should resolve exhaustively within about half of each range, which
+    # leaves dozens of values between the two rather than a handful.
+    kept = only_observable(x).choices + only_observable(y).choices
+    assert len(kept) >= 40
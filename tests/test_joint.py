@@ -0,0 +1,140 @@
+from hypothesis import strategies as st
+from hypothesis import given
+from schroedinteger import schroedinteger, observe, observe_predicates, \
+    all_, any_
+
+from tests.common import mixed_integers, only_observable
+
+
+def nonnegative(v):
+    return v >= 0
+
+
+@given(st.lists(mixed_integers))
+def test_all_agrees_with_eventual_answer(xs):
+    answer = all_(xs, nonnegative)
+    assert answer == all(int(x) >= 0 for x in xs)
+
+
+@given(st.lists(mixed_integers))
+def test_any_agrees_with_eventual_answer(xs):
+    answer = any_(xs, nonnegative)
+    assert answer == any(int(x) >= 0 for x in xs)
+
+
+@given(st.lists(mixed_integers))
+def test_predicates_agree_with_eventual_answer(xs):
+    answers = observe_predicates(xs, nonnegative)
+    assert answers == tuple(int(x) >= 0 for x in xs)
+
+
+@given(mixed_integers, mixed_integers, mixed_integers)
+def test_observe_agrees_with_eventual_answer(x, y, z):
+    answer = observe(lambda a, b, c: a < b < c, x, y, z)
+    assert answer == (int(x) < int(y) < int(z))
+
+
+@given(st.lists(mixed_integers))
+def test_later_observations_agree_with_all(xs):
+    if all_(xs, nonnegative):
+        assert all(x >= 0 for x in xs)
+
+
+def test_all_of_nothing_is_true():
+    assert all_([])
+    assert not any_([])
+
+
+def test_all_can_go_either_way():
+    seen = set()
+    for _ in range(100):
+        xs = [schroedinteger([-1, 1]) for _ in range(5)]
+        seen.add(all_(xs, nonnegative))
+    assert seen == {True, False}
+
+
+def choices(x):
+    return only_observable(x).choices
+
+
+def wide_values():
+    return [schroedinteger(range(-10, 10 + i)) for i in range(10)]
+
+
+@given(st.random_module())
+def test_all_keeps_indeterminacy(rnd):
+    xs = wide_values()
+    if all_(xs, nonnegative):
+        for i, x in enumerate(xs):
+            assert choices(x) == list(range(0, 10 + i))
+    else:
+        narrowed = [x for i, x in enumerate(xs) if choices(x) != list(
+            range(-10, 10 + i))]
+        assert len(narrowed) == 1
+        assert choices(narrowed[0]) == list(range(-10, 0))
+
+
+@given(st.random_module())
+def test_any_keeps_indeterminacy(rnd):
+    xs = wide_values()
+    if not any_(xs, nonnegative):
+        for x in xs:
+            assert choices(x) == list(range(-10, 0))
+    else:
+        narrowed = [x for i, x in enumerate(xs) if choices(x) != list(
+            range(-10, 10 + i))]
+        assert len(narrowed) == 1
+        assert min(choices(narrowed[0])) == 0
+
+
+@given(st.random_module())
+def test_predicates_keep_indeterminacy(rnd):
+    xs = wide_values()
+    answers = observe_predicates(xs, nonnegative)
+    for i, (x, answer) in enumerate(zip(xs, answers)):
+        if answer:
+            assert choices(x) == list(range(0, 10 + i))
+        else:
+            assert choices(x) == list(range(-10, 0))
+
+
+@given(mixed_integers, mixed_integers, st.random_module())
+def test_all_of_shared_values_agrees_with_eventual_answer(x, y, rnd):
+    xs = [x, x + 1, y, y * 2, 3]
+    answer = all_(xs, nonnegative)
+    assert answer == all(int(v) >= 0 for v in xs)
+
+
+@given(st.random_module())
+def test_all_keeps_indeterminacy_with_shared_values(rnd):
+    x = schroedinteger(range(-5, 5))
+    y = schroedinteger(range(-5, 5))
+    u = schroedinteger([-1, -2])
+    v = schroedinteger([-1, -2])
+    zs = wide_values()
+    before = [list(choices(t)) for t in [x, y, u, v] + zs]
+    assert not all_([x, x + y, y, u + v, u] + zs, nonnegative)
+    after = [choices(t) for t in [x, y, u, v] + zs]
+    changed = [i for i, (b, a) in enumerate(zip(before, after)) if b != a]
+    # Only one group is narrowed to make the answer False: Either x and y
+    # together or a single one of zs. u + v is always negative so needs no
+    # narrowing at all.
+    if changed and changed[0] < 2:
+        assert max(changed) < 2
+        assert not any(
+            a >= 0 and a + b >= 0 and b >= 0
+            for a in choices(x) for b in choices(y)
+        )
+    else:
+        assert len(changed) <= 1
+
+
+@given(st.random_module())
+def test_all_true_narrows_shared_values(rnd):
+    x = schroedinteger(range(-5, 5))
+    y = schroedinteger(range(-5, 5))
+    zs = wide_values()
+    if all_([x, x + y, y] + zs, nonnegative):
+        assert all(t >= 0 for t in [x, x + y, y] + zs)
+        for i, z in enumerate(zs):
+            assert choices(z) == list(range(0, 10 + i))